@@ -2,8 +2,6 @@
 Finally derive the Black-Scholes formula by splitting the calculation into an expectation and a probability calculation.
 A discounting step is introduced at the very end to complete the derivation.
 """
-from scipy.stats import lognorm
-
 from shared_data_and_functions import *
 
 
@@ -20,8 +18,8 @@ class AnalyticCalculation(Scene):
         self.play(Create(ax, run_time=2.0), Write(labels, run_time=2.0))
         self.wait(1.0)
 
-        simulation_paths = [simple_stock_simulation(start_price=stock_S0, sigma=stock_sigma, T=T, seed=i)
-                            for i in range(100, 200)]
+        simulation_paths = cached_stock_simulations(start_price=stock_S0, sigma=stock_sigma, T=T,
+                                                    seeds=range(100, 200))
         simulation_graphs = [
             ax.plot_line_graph(
                 x_values=np.linspace(0, T, len(simulated_path)),
@@ -65,9 +63,9 @@ class AnalyticCalculation(Scene):
 
         lognorm_sigma = stock_sigma * np.sqrt(T)
         lognorm_mu = -stock_sigma ** 2 / 2 * T
-        lognormal_pdf = lambda xs: lognorm.pdf(xs / stock_S0, loc=lognorm_mu, s=lognorm_sigma) / stock_S0
         distribution_graph = distribution_ax.plot(
-            lognormal_pdf, x_range=stock_range[:2], color=BLUE
+            lambda x: lognormal_pdf(x, S0=stock_S0, mu=lognorm_mu, sigma=lognorm_sigma),
+            x_range=stock_range[:2], color=BLUE
         )
         self.play(Create(distribution_graph, rate_func=linear), run_time=2.0)
         self.wait(1.0)
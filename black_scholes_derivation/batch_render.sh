@@ -1,6 +1,8 @@
 # Rendering a batch in 480p15, 1080p60, and 2160p60 quality in parallel. Due to codec restrictions in DaVinci Resolve's
 # Linux release, the final high-quality render will eventually need to be converted like so
 #   for i in *.mp4; do ffmpeg -i "$i" -vcodec dnxhd -profile:v dnxhr_lb -acodec pcm_s16le -f mov -y "${i%.*}.mov"; done
+#
+# Simulated paths are stored in ./path_cache (see path_cache.py), so the three passes share one set of simulations.
 (ls *.py | xargs -n 1 nice -n 19 manim -a -ql --media_dir media_ql) &
 (sleep 1 && ls *.py | xargs -n 1 nice -n 19 manim -a --media_dir media_qh) &
 (sleep 2 && ls *.py | xargs -n 1 nice -n 19 manim -a -qk --media_dir media_qk) &
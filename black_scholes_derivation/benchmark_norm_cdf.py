@@ -0,0 +1,36 @@
+"""
+Compare the per-call latency of scipy.stats.norm.cdf against the _norm_cdf kernel used by the pricing helpers.
+
+The kernel skips the argument checking and dispatch in norm.cdf, which dominates on the small arrays priced per frame.
+"""
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+from shared_data_and_functions import _norm_cdf
+
+
+def benchmark_norm_cdf(sizes=tuple(10 ** k for k in range(7))):
+    """Per-call latency of norm.cdf against _norm_cdf writing into a preallocated buffer."""
+    rng = np.random.default_rng(0)
+    print(f"{'size':>8} {'norm.cdf (s)':>14} {'_norm_cdf (s)':>14} {'speedup':>8}")
+    for size in sizes:
+        x, out = rng.standard_normal(size), np.empty(size)
+        n_repeats = max(10, 10 ** 6 // size)
+
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            norm.cdf(x)
+        scipy_stats_time = (time.perf_counter() - start) / n_repeats
+
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            _norm_cdf(x, out=out)
+        kernel_time = (time.perf_counter() - start) / n_repeats
+
+        print(f"{size:>8} {scipy_stats_time:>14.2e} {kernel_time:>14.2e} {scipy_stats_time / kernel_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark_norm_cdf()
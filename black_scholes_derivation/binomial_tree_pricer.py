@@ -0,0 +1,94 @@
+"""
+Binomial tree option pricer, converging to black_scholes_price as the number of steps grows.
+
+Backward induction runs in place over one row of n_steps + 1 node values per strike, so memory is O(n_steps) and there
+are no per-node Python objects. A whole vector of strikes is priced in the same pass. Both the Cox-Ross-Rubinstein
+tree and the Leisen-Reimer tree (which centers the tree on the strike, converging much faster) are supported.
+
+Running this file directly prints the error against black_scholes_price and the time for a range of step counts.
+"""
+import time
+
+import numpy as np
+
+from shared_data_and_functions import black_scholes_price
+
+
+def _peizer_pratt(z, n_steps):
+    """Peizer-Pratt inversion of the normal CDF onto a binomial probability, as used by Leisen-Reimer."""
+    exponent = -np.square(z / (n_steps + 1 / 3 + 0.1 / (n_steps + 1))) * (n_steps + 1 / 6)
+    return 0.5 + np.sign(z) * 0.5 * np.sqrt(1 - np.exp(exponent))
+
+
+def _tree_parameters(S0, K, sigma, t, r, n_steps, method):
+    """Up and down factors and the risk-neutral up probability, each with one entry per strike."""
+    dt = t / n_steps
+    growth = np.exp(r * dt)
+    if method == "crr":
+        up = np.full(K.shape, np.exp(sigma * np.sqrt(dt)))
+        down = 1 / up
+        probability = (growth - down) / (up - down)
+    elif method == "leisen_reimer":
+        d_plus = (np.log(S0 / K) + (r + sigma ** 2 / 2) * t) / (sigma * np.sqrt(t))
+        probability = _peizer_pratt(d_plus - sigma * np.sqrt(t), n_steps)
+        up = growth * _peizer_pratt(d_plus, n_steps) / probability
+        down = (growth - probability * up) / (1 - probability)
+    else:
+        raise ValueError(f"unknown tree method {method!r}")
+    return up, down, probability
+
+
+def binomial_tree_price(S0, K, sigma, t, r, n_steps=1000, method="crr", option_type="call", early_exercise=False):
+    """
+    Option price from an n_steps binomial tree, for a scalar or 1-D array of strikes K.
+
+    method is "crr" or "leisen_reimer" (which rounds n_steps up to an odd number). With early_exercise, the value is
+    floored at the payoff at every node, i.e. an American option.
+    """
+    if option_type not in ("call", "put"):
+        raise ValueError(f"unknown option type {option_type!r}")
+    if method == "leisen_reimer":
+        n_steps += 1 - n_steps % 2
+
+    K = np.asarray(K, dtype=float)
+    strikes = K.reshape(-1, 1)
+    up, down, probability = _tree_parameters(S0, strikes, sigma, t, r, n_steps, method)
+    discount = np.exp(-r * t / n_steps)
+    up_weight, down_weight = discount * probability, discount * (1 - probability)
+
+    up_moves = np.arange(n_steps + 1)
+    terminal_prices = S0 * up ** up_moves * down ** (n_steps - up_moves)
+    sign = 1.0 if option_type == "call" else -1.0
+    values = np.maximum(sign * (terminal_prices - strikes), 0.0)
+    scratch = np.empty_like(values)
+
+    for n_nodes in range(n_steps, 0, -1):
+        np.multiply(values[:, 1:n_nodes + 1], up_weight, out=scratch[:, :n_nodes])
+        values[:, :n_nodes] *= down_weight
+        values[:, :n_nodes] += scratch[:, :n_nodes]
+        if early_exercise:
+            # node j of this level has j up moves and n_nodes - 1 - j down moves
+            level_prices = terminal_prices[:, :n_nodes] * down ** (n_nodes - 1 - n_steps)
+            np.maximum(values[:, :n_nodes], sign * (level_prices - strikes), out=values[:, :n_nodes])
+
+    return values[:, 0].reshape(K.shape)[()]
+
+
+def benchmark_convergence(step_counts=(10, 100, 1000, 10 ** 4), n_strikes=31):
+    """Error against black_scholes_price and time per pricing for each tree, using BlackScholesVisualization's setup."""
+    option = dict(S0=300.0, sigma=0.10, t=0.25, r=0.04)
+    strikes = np.linspace(290.0, 320.0, n_strikes)
+    exact = black_scholes_price(K=strikes, **option)
+
+    print(f"{n_strikes} strikes per pricing")
+    print(f"{'steps':>8} {'method':>14} {'max error ($)':>14} {'seconds':>10}")
+    for n_steps in step_counts:
+        for method in ("crr", "leisen_reimer"):
+            start = time.perf_counter()
+            prices = binomial_tree_price(K=strikes, n_steps=n_steps, method=method, **option)
+            elapsed = time.perf_counter() - start
+            print(f"{n_steps:>8} {method:>14} {np.abs(prices - exact).max():>14.2e} {elapsed:>10.4f}")
+
+
+if __name__ == "__main__":
+    benchmark_convergence()
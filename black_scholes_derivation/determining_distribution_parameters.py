@@ -1,8 +1,6 @@
 """
 Derive the PDF of a lognormal distribution and the parameters for a particular stock (mu, sigma).
 """
-from scipy.optimize import bisect
-
 from how_to_simulate import create_normal_lognormal_comparison
 from shared_data_and_functions import *
 
@@ -103,8 +101,8 @@ class DeterminingDistributionMu(Scene):
         # highlight the areas where the PDF has changed drastically
         # there's a small hack here that we use get_area() on graphs we don't actually plot because that function
         # doesn't actually work on the output from the plot_line_graph() function we were using earlier
-        left_pdf_intersection = bisect(lambda x: (specific_norm_pdf(x) - specific_lognorm_pdf(x)), 0, 15, xtol=1e-8)
-        right_pdf_intersection = bisect(lambda x: (specific_norm_pdf(x) - specific_lognorm_pdf(x)), 30, 50, xtol=1e-8)
+        pdf_intersections = curve_crossings(specific_norm_pdf, specific_lognorm_pdf, ax.x_range)
+        left_pdf_intersection, right_pdf_intersection = pdf_intersections[0], pdf_intersections[-1]
         lognorm_graph = ax.plot(specific_lognorm_pdf, x_range=ax.x_range[:2])
         norm_graph = ax.plot(specific_norm_pdf, x_range=ax.x_range[:2])
         left_area = ax.get_area(lognorm_graph, x_range=(ax.x_range[0], left_pdf_intersection),
@@ -361,29 +359,24 @@ class DeterminingDistributionSigmaAndSt(Scene):
         self.play(Create(past_graph, rate_func=linear, run_time=1.0))
         self.wait(1.0)
 
-        def create_future_graph_and_text(sigma):
-            """Plotting a simulation of the future stock price to be animated as sigma changes."""
-            graph = ax.plot_line_graph(
-                x_values=np.linspace(0.5, 1.0, len(simulated_path)),
-                y_values=simple_stock_simulation(start_price=simulated_path[-1], sigma=sigma, seed=1, T=0.5),
-                line_color=GREEN,
-                add_vertex_dots=False
-            )
+        future_xs = np.linspace(0.5, 1.0, len(simulated_path))
+        simulate_future = lambda sigma: simple_stock_simulation(start_price=simulated_path[-1], sigma=sigma, seed=1,
+                                                                T=0.5)
+
+        def create_sigma_text():
+            """Labeling the sigma of the simulated future stock price to be animated as sigma changes."""
             text = MathTex(rf"\sigma = {future_sigma.get_value() * 100:.1f}\%", font_size=MATH_SIZE_MEDIUM)
-            return graph, text.move_to(ax.get_center() + UP * 2.0 + RIGHT * 2.0)
+            return text.move_to(ax.get_center() + UP * 2.0 + RIGHT * 2.0)
 
         future_sigma = ValueTracker(0.1)
-        sigma_text, future_graph = create_future_graph_and_text(future_sigma.get_value())
+        future_graph = LiveLineGraph(ax, future_xs, simulate_future(future_sigma.get_value()), line_color=GREEN)
+        sigma_text = create_sigma_text()
         self.play(FadeIn(sigma_text), Create(future_graph, rate_func=linear), run_time=1.0)
         self.wait(1.0)
 
         # intuition here is that 10% is too low for this historical data, 30% is too high, 20% is about right
-        future_graph.add_updater(
-            lambda g: g.become(create_future_graph_and_text(future_sigma.get_value())[0])
-        )
-        sigma_text.add_updater(
-            lambda t: t.become(create_future_graph_and_text(future_sigma.get_value())[1])
-        )
+        future_graph.add_updater(lambda g: g.set_y_values(simulate_future(future_sigma.get_value())))
+        sigma_text.add_updater(lambda t: t.become(create_sigma_text()))
         self.play(future_sigma.animate.set_value(0.3), run_time=2.0)
         self.wait(1.0)
         self.play(future_sigma.animate.set_value(0.2), run_time=2.0)
@@ -2,6 +2,7 @@
 Mention the difficulty of pricing an asset that depends on (unknown) future stock prices, and how a simulation could
 address this.
 """
+from running_statistics import RunningMoments, StreamingHistogram
 from shared_data_and_functions import *
 
 
@@ -32,12 +33,8 @@ class GuessingTheFuture(Scene):
 
         # continue forward to "guess" possible futures
         # push possibilities up/down (via Brownian bridges) to aid spoken explanation
-        brownian_rvs = [simple_stock_simulation(start_price=simulated_path[-1], sigma=0.15, seed=seed, T=0.5)
-                        - simulated_path[-1] for seed in [4, 1, 2]]
-        ts = np.linspace(0, 0.5, len(brownian_rvs[0]))
-        brownian_rvs = [sim - ts / 0.5 * sim[-1]
-                        + np.linspace(simulated_path[-1], end_point, len(sim))
-                        for sim, end_point in zip(brownian_rvs, [350, 300, 250])]
+        brownian_rvs = brownian_bridge_stock_simulations(start_price=simulated_path[-1], end_prices=[350, 300, 250],
+                                                         sigma=0.15, seeds=[4, 1, 2], T=0.5)
 
         possible_futures_graphs = [
             ax.plot_line_graph(
@@ -72,42 +69,55 @@ class DemonstrateSimulation(Scene):
     everything is transparent.
     """
     _current_seed = 12347
+    _seeds_per_batch = 64
+    _pending_paths = []
     simulation_paths = []
     simulation_graphs = []
-    histogram_counts = [0.0] * 11
+    # option profit rounded to the nearest $5, from $0 to $50
+    profit_histogram = StreamingHistogram(bin_edges=5 * np.arange(12) - 2.5)
+    profit_moments = RunningMoments()
 
-    def generate_next_path(self, ax):
-        """Generates a path and updates the class bookkeeping for use in the other functions."""
+    def generate_next_paths(self, ax, num_paths=1):
+        """Generates paths and updates the class bookkeeping for use in the other functions."""
         T = 0.25
-        simulated_path = simple_stock_simulation(start_price=300, sigma=0.1, T=T, seed=self._current_seed)
-        self._current_seed += 1
-
-        graph = ax.plot_line_graph(
-            x_values=np.linspace(0, T, len(simulated_path)),
-            y_values=simulated_path,
-            line_color=BLUE,
-            add_vertex_dots=False
-        )
-        self.simulation_paths.append(simulated_path)
-        self.simulation_graphs.append(graph)
-
-        rounded_profit = int(round((simulated_path[-1] - 300) / 5, 0) * 5)
-        bin_idx = min(max(0, rounded_profit // 5), len(self.histogram_counts) - 1)
-        self.histogram_counts[bin_idx] += 1
+        new_paths = []
+        for _ in range(num_paths):
+            if not self._pending_paths:
+                # simulating ahead in batches since the schedule below asks for paths a few at a time
+                self._pending_paths = list(cached_stock_simulations(
+                    start_price=300, sigma=0.1, T=T,
+                    seeds=range(self._current_seed, self._current_seed + self._seeds_per_batch)
+                ))
+            new_paths.append(self._pending_paths.pop(0))
+            self._current_seed += 1
+
+        for simulated_path in new_paths:
+            graph = ax.plot_line_graph(
+                x_values=np.linspace(0, T, len(simulated_path)),
+                y_values=simulated_path,
+                line_color=BLUE,
+                add_vertex_dots=False
+            )
+            self.simulation_paths.append(simulated_path)
+            self.simulation_graphs.append(graph)
+
+        profits = np.array([simulated_path[-1] - 300 for simulated_path in new_paths])
+        self.profit_histogram.update(profits)
+        self.profit_moments.update(np.maximum(profits, 0.0))
 
     def construct(self):
         # left: simulated stock prices
         ax, labels, strike_line = stock_price_simulation_graph()
         self.play(Create(ax), Write(labels), Create(strike_line, rate_func=linear), run_time=1.0)
 
-        self.generate_next_path(ax)
+        self.generate_next_paths(ax)
         self.play(Create(self.simulation_graphs[-1], rate_func=linear), run_time=1.0)
         self.wait(1.0)
 
         # right: histogram of option profit
         bar_chart = BarChart(
-            values=[0.0] * len(self.histogram_counts),
-            bar_names=[fr"\${5 * i}" if i % 2 == 0 else "" for i in range(len(self.histogram_counts))],
+            values=[0.0] * len(self.profit_histogram.counts),
+            bar_names=[fr"\${5 * i}" if i % 2 == 0 else "" for i in range(len(self.profit_histogram.counts))],
             y_range=[0, 1.01, 0.25],
             bar_colors=[BLUE],
             x_length=4,
@@ -120,7 +130,7 @@ class DemonstrateSimulation(Scene):
         self.play(Create(bar_chart), Write(bar_labels), run_time=2.0)
         self.wait(1.0)
 
-        self.play(bar_chart.animate.change_bar_values([x / sum(self.histogram_counts) for x in self.histogram_counts]))
+        self.play(bar_chart.animate.change_bar_values(self.profit_histogram.frequencies))
         self.wait(1.0)
 
         # ~550 paths over 5.3 seconds, exponentially decaying
@@ -138,12 +148,11 @@ class DemonstrateSimulation(Scene):
             self.play(*[
                 self.simulation_graphs[-idx].animate.set_stroke(opacity=path_opacity())
                 for idx in range(1, num_paths_this_tick + 1)], run_time=run_time)
-            for _ in range(num_paths_this_tick):
-                self.generate_next_path(ax)
+            self.generate_next_paths(ax, num_paths_this_tick)
 
             self.play(
                 *[Create(self.simulation_graphs[-idx], rate_func=linear) for idx in range(1, num_paths_this_tick + 1)],
-                bar_chart.animate.change_bar_values([x / sum(self.histogram_counts) for x in self.histogram_counts]),
+                bar_chart.animate.change_bar_values(self.profit_histogram.frequencies),
                 run_time=run_time
             )
         else:
@@ -161,7 +170,7 @@ class DemonstrateSimulation(Scene):
                                 for bar in bar_chart.bars], run_time=1.0, lag_ratio=0.1))
 
         # plot a vertical line at the average profit
-        average_profit = np.mean([max(0, sim[-1] - 300) for sim in self.simulation_paths])
+        average_profit = self.profit_moments.mean
         # division by 5 in the c2p is needed to account for each bar being $5 wide
         average_profit_line = DashedLine(bar_chart.c2p(average_profit / 5, 0),
                                          bar_chart.c2p(average_profit / 5, 1.0),
@@ -2,8 +2,6 @@
 Explain qualities of a simulation that we would like to have, and the corresponding distribution that gives us these
 qualities is the lognormal distribution.
 """
-from scipy.stats import lognorm
-
 from shared_data_and_functions import *
 
 
@@ -23,8 +21,8 @@ def create_normal_lognormal_comparison(ax):
     normal_dist_original = price_distribution.copy().set_stroke(opacity=0.5).set_color(GRAY)
 
     # rescaling S(t)/S(0) ~ exp(N()) to S(t) ~ S(0) * exp(N())
-    specific_lognorm_pdf = lambda xs: lognorm.pdf(xs / norm_mu, loc=0.0, s=norm_sigma / norm_mu) / norm_mu
-    lognormal_dist = ax.plot_line_graph(plot_xs, specific_lognorm_pdf(plot_xs),
+    specific_lognorm_pdf = lambda xs: lognormal_pdf(xs, S0=norm_mu, mu=0.0, sigma=norm_sigma / norm_mu)
+    lognormal_dist = ax.plot_line_graph(*sampled_lognormal_pdf(norm_mu, 0.0, norm_sigma / norm_mu, *ax.x_range[:2]),
                                         line_color=BLUE, add_vertex_dots=False, z_index=1)
 
     # emphasize the major differences, left: no negatives, right: compounding (multiplying) returns
@@ -76,15 +74,14 @@ class DesiredSimulationQualities(Scene):
         # plotting out an arbitrary normal distribution of future prices
         scale_tracker = ValueTracker(5.0)
         plot_xs = np.linspace(*ax.x_range[:2], 1000)
-        normal_dist = ax.plot_line_graph(plot_xs, norm.pdf(plot_xs, loc=20, scale=scale_tracker.get_value()),
-                                         line_color=BLUE, add_vertex_dots=False)
+        normal_dist = LiveLineGraph(ax, plot_xs, norm.pdf(plot_xs, loc=20, scale=scale_tracker.get_value()),
+                                    line_color=BLUE)
         self.play(Create(normal_dist, run_time=2.0))
         self.wait(1.0)
 
         # animate out the scale getting larger, eventually hitting negative numbers with non-negligible probability
         normal_dist.add_updater(
-            lambda x: x.become(ax.plot_line_graph(plot_xs, norm.pdf(plot_xs, loc=20, scale=scale_tracker.get_value()),
-                                                  line_color=BLUE, add_vertex_dots=False))
+            lambda x: x.set_y_values(norm.pdf(plot_xs, loc=20, scale=scale_tracker.get_value()))
         )
         self.play(scale_tracker.animate.set_value(10.0), run_time=2.0)
         self.wait(1.0)
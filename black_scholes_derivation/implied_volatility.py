@@ -0,0 +1,115 @@
+"""
+Vectorized implied volatility, inverting black_scholes_price for sigma across whole arrays of option quotes.
+
+Every quote starts from a rational approximation and takes safeguarded Newton steps using the vectorized vega, falling
+back to bisection whenever a Newton step would leave the bracket known to contain the answer or is crawling (more than
+half the size of the previous step). Quotes drop out of the iteration individually as they converge.
+
+Running this file directly compares the solver against the scalar scipy.optimize approach on a synthetic option chain.
+"""
+import time
+
+import numpy as np
+from scipy.optimize import brentq
+
+from shared_data_and_functions import black_scholes_greeks, black_scholes_price
+
+
+def _initial_guess(price, S0, discounted_strike, t):
+    """Corrado-Miller rational approximation of sigma, which is accurate near the money."""
+    half_moneyness = (S0 - discounted_strike) / 2
+    radicand = np.maximum((price - half_moneyness) ** 2 - 4 * half_moneyness ** 2 / np.pi, 0.0)
+    total_volatility = np.sqrt(2 * np.pi) / (S0 + discounted_strike) * (price - half_moneyness + np.sqrt(radicand))
+    return total_volatility / np.sqrt(t)
+
+
+def implied_volatility(price, S0, K, t, r, tol=1e-10, max_iterations=100, sigma_bounds=(1e-6, 10.0)):
+    """
+    Solve black_scholes_price(S0, K, sigma, t, r) = price for sigma, elementwise over broadcast arrays.
+
+    Returns (sigma, converged, iterations), where converged marks the quotes whose sigma was pinned down to within tol
+    (by the Newton step size, or the width of a bracket with prices evaluated on both sides of the quote) and
+    iterations counts the steps each quote took. Quotes without an implied volatility in sigma_bounds come back as nan,
+    e.g. those outside the no-arbitrage bounds max(S0 - D * K, 0) < price < S0 or so deep in the money that the time
+    value is lost to rounding.
+    """
+    price, S0, K, t, r = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, S0, K, t, r)))
+    shape = price.shape
+    price, S0, K, t, r = (x.ravel() for x in (price, S0, K, t, r))
+    discounted_strike = np.exp(-r * t) * K
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid = (price > np.maximum(S0 - discounted_strike, 0.0)) & (price < S0) & (t > 0)
+        sigma = _initial_guess(price, S0, discounted_strike, t)
+    lower, upper = np.full(len(price), float(sigma_bounds[0])), np.full(len(price), float(sigma_bounds[1]))
+    sigma = np.where(np.isfinite(sigma) & (sigma > lower) & (sigma < upper), sigma, (lower + upper) / 2)
+
+    previous_step = np.full(len(price), np.inf)
+    # a bracket only contains the answer once it has been priced above and below the quote, rather than collapsing
+    # onto one of the sigma_bounds
+    seen_above, seen_below = np.zeros(len(price), dtype=bool), np.zeros(len(price), dtype=bool)
+    converged = np.zeros(len(price), dtype=bool)
+    iterations = np.zeros(len(price), dtype=np.int64)
+    active = np.flatnonzero(valid)
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+
+        option = dict(S0=S0[active], K=K[active], sigma=sigma[active], t=t[active], r=r[active])
+        error = black_scholes_price(**option) - price[active]
+        vega = black_scholes_greeks(**option)["vega"]
+        iterations[active] += 1
+
+        # the price increases with sigma, so every evaluation tightens the bracket on one side
+        too_high = error > 0
+        upper[active] = np.where(too_high, option["sigma"], upper[active])
+        lower[active] = np.where(too_high, lower[active], option["sigma"])
+        seen_above[active] |= too_high
+        seen_below[active] |= error < 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = option["sigma"] - error / vega
+        newton_step = np.abs(newton - option["sigma"])
+        # Newton steps that don't at least halve from one iteration to the next are crawling, so bisect instead
+        use_newton = (np.isfinite(newton) & (newton > lower[active]) & (newton < upper[active])
+                      & (newton_step <= previous_step[active] / 2))
+        collapsed = upper[active] - lower[active] <= tol
+        done = (newton_step <= tol) | (collapsed & seen_above[active] & seen_below[active])
+        next_sigma = np.where(use_newton, newton, (lower[active] + upper[active]) / 2)
+        previous_step[active] = np.abs(next_sigma - option["sigma"])
+        sigma[active] = np.where(done, option["sigma"], next_sigma)
+        converged[active] = done
+        active = active[~(done | collapsed)]
+
+    sigma[~converged] = np.nan
+    return sigma.reshape(shape)[()], converged.reshape(shape)[()], iterations.reshape(shape)[()]
+
+
+def benchmark_implied_volatility(n_quotes=10 ** 6, n_scalar_quotes=1000):
+    """Time implied_volatility on a synthetic chain against scipy.optimize.brentq on a subset of the same quotes."""
+    rng = np.random.default_rng(0)
+    S0 = 300.0
+    K = S0 * np.exp(rng.uniform(-0.3, 0.3, n_quotes))
+    t = rng.uniform(0.05, 2.0, n_quotes)
+    r = rng.uniform(0.0, 0.08, n_quotes)
+    true_sigma = rng.uniform(0.05, 0.8, n_quotes)
+    price = black_scholes_price(S0=S0, K=K, sigma=true_sigma, t=t, r=r)
+
+    start = time.perf_counter()
+    sigma, converged, iterations = implied_volatility(price, S0, K, t, r)
+    vectorized_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n_scalar_quotes):
+        brentq(lambda s: black_scholes_price(S0, K[i], s, t[i], r[i]) - price[i], 1e-6, 10.0, xtol=1e-12)
+    scalar_time = (time.perf_counter() - start) / n_scalar_quotes * n_quotes
+
+    print(f"{n_quotes} quotes: {vectorized_time:.2f}s vectorized vs. ~{scalar_time:.0f}s with scalar brentq")
+    repricing_error = np.abs(black_scholes_price(S0=S0, K=K, sigma=sigma, t=t, r=r) - price)[converged]
+    print(f"converged: {converged.mean():.4%}, mean iterations: {iterations.mean():.2f}, "
+          f"max repricing error: ${repricing_error.max():.2e}, "
+          f"median sigma error: {np.median(np.abs(sigma - true_sigma)[converged]):.2e}")
+
+
+if __name__ == "__main__":
+    benchmark_implied_volatility()
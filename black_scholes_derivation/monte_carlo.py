@@ -0,0 +1,165 @@
+"""
+Monte Carlo option pricing from streamed terminal stock prices.
+
+Pricing by averaging max(0, S(t) - K) only needs the terminal prices, so paths are never materialized. Terminal prices
+are drawn straight from their lognormal distribution in fixed-size chunks, which keeps memory constant regardless of
+the number of paths.
+
+variance_reduced_call_price instead prices with antithetic variates and a control variate, which reaches the same
+confidence interval with far fewer paths.
+
+Running this file directly pushes 10^8 paths through the "fair price" demonstration from DemonstrateSimulation,
+compares how many paths each variance reduction technique needs, and compares the convergence of Sobol
+quasi-Monte Carlo paths against pseudo-random ones.
+"""
+import time
+
+import numpy as np
+
+from running_statistics import RunningMoments
+from shared_data_and_functions import (black_scholes_price, path_rng, simple_stock_simulations,
+                                       sobol_stock_simulations)
+
+
+def terminal_price_chunks(start_price=100, sigma=0.15, dt=1 / 252, T=1, n_paths=1, chunk_size=2 ** 20,
+                          scene="terminal_price_chunks"):
+    """
+    Yield the terminal prices of n_paths simulations in chunks of at most chunk_size.
+
+    These follow the same distribution as the last column of simple_stock_simulations with the same arguments. Chunk k
+    is drawn from path_rng(scene, k), so the prices depend on chunk_size but not on anything else.
+    """
+    n_steps = int(T / dt)
+    horizon = (n_steps - 1) * dt  # the first simulated step is pinned at the start price
+
+    for chunk_idx, first_path in enumerate(range(0, n_paths, chunk_size)):
+        prices = path_rng(scene, chunk_idx).standard_normal(min(chunk_size, n_paths - first_path))
+        prices *= sigma * np.sqrt(horizon)
+        prices -= sigma ** 2 / 2 * horizon
+        np.exp(prices, out=prices)
+        prices *= start_price
+        yield prices
+
+
+def call_payoff_chunks(strike, **simulation_kwargs):
+    """
+    Yield (terminal_prices, payoff_mean, payoff_std_error) for each chunk of terminal_price_chunks.
+
+    The mean and standard error are running statistics of max(0, S(t) - K) over every path streamed so far.
+    """
+    payoff_moments = RunningMoments()
+    for prices in terminal_price_chunks(**simulation_kwargs):
+        payoff_moments.update(np.maximum(prices - strike, 0.0))
+        yield prices, payoff_moments.mean, payoff_moments.std_error
+
+
+def monte_carlo_call_price(strike, **simulation_kwargs):
+    """Average call payoff and its standard error over all the paths from call_payoff_chunks."""
+    mean, std_error = np.nan, np.nan
+    for _, mean, std_error in call_payoff_chunks(strike, **simulation_kwargs):
+        pass
+    return mean, std_error
+
+
+def variance_reduced_call_price(S0, K, sigma, t, r, n_paths=10_000, antithetic=True, control_variate="call",
+                                scene="variance_reduced_call_price"):
+    """
+    Monte Carlo estimate of the call price (matching black_scholes_price) and its standard error.
+
+    With antithetic, paths come in pairs driven by Z and -Z. The control_variate can be "stock" (the discounted terminal
+    price, whose mean is S0), "call" (a call struck at the forward price S0 / D, whose mean is black_scholes_price), or
+    None. Its coefficient is estimated from the same paths.
+
+    n_paths must give at least two independent samples for the standard error, or three with a control variate (whose
+    coefficient fits two samples exactly), and be even with antithetic, where each pair is one sample.
+    """
+    min_samples = 2 if control_variate is None else 3
+    min_paths = 2 * min_samples if antithetic else min_samples
+    if antithetic and n_paths % 2:
+        raise ValueError(f"antithetic pricing needs an even n_paths, got {n_paths}")
+    if n_paths < min_paths:
+        raise ValueError(f"n_paths must be at least {min_paths} with antithetic={antithetic} and "
+                         f"control_variate={control_variate!r}, got {n_paths}")
+
+    D = np.exp(-r * t)
+    normals = path_rng(scene, 0).standard_normal(n_paths // 2 if antithetic else n_paths)
+    if antithetic:
+        normals = np.stack([normals, -normals])
+    terminal_prices = S0 * np.exp((r - sigma ** 2 / 2) * t + sigma * np.sqrt(t) * normals)
+
+    samples = D * np.maximum(terminal_prices - K, 0.0)
+    if control_variate == "stock":
+        controls, control_mean = D * terminal_prices, S0
+    elif control_variate == "call":
+        controls = D * np.maximum(terminal_prices - S0 / D, 0.0)
+        control_mean = black_scholes_price(S0=S0, K=S0 / D, sigma=sigma, t=t, r=r)
+    elif control_variate is None:
+        controls, control_mean = None, None
+    else:
+        raise ValueError(f"unknown control variate {control_variate!r}")
+
+    if antithetic:  # each pair is a single independent sample
+        samples = samples.mean(axis=0)
+        controls = None if controls is None else controls.mean(axis=0)
+    if controls is not None:
+        covariance = np.cov(samples, controls)
+        if covariance[1, 1] > 0:
+            samples = samples - covariance[0, 1] / covariance[1, 1] * (controls - control_mean)
+
+    ddof = 1 if controls is None else 2  # the fitted control coefficient uses up another degree of freedom
+    return samples.mean(), samples.std(ddof=ddof) / np.sqrt(len(samples))
+
+
+def demonstrate_streaming(n_paths=10 ** 8):
+    """Push n_paths through the DemonstrateSimulation setup, where the average profit is the (undiscounted) price."""
+    start_price, strike, sigma, dt, T = 300, 300, 0.1, 1 / 252, 0.25
+
+    start = time.perf_counter()
+    price, std_error = monte_carlo_call_price(strike, start_price=start_price, sigma=sigma, dt=dt, T=T,
+                                              n_paths=n_paths)
+    elapsed = time.perf_counter() - start
+
+    analytic = black_scholes_price(S0=start_price, K=strike, sigma=sigma, t=(int(T / dt) - 1) * dt, r=0.0)
+    print(f"{n_paths:.0e} paths in {elapsed:.1f}s: ${price:.4f} +/- {std_error:.4f} (analytic ${analytic:.4f})")
+
+
+def benchmark_variance_reduction(n_paths=10_000, target_std_error=0.01):
+    """Compare the paths each technique needs for a target standard error, using BlackScholesVisualization's setup."""
+    option = dict(S0=300.0, K=310.0, sigma=0.10, t=0.25, r=0.04)
+    print(f"analytic price: ${black_scholes_price(**option):.4f}")
+    print(f"{'technique':>22} {'estimate':>10} {'std error':>10} {'paths for +/-' + str(target_std_error):>20}")
+    for name, kwargs in [("plain", dict(antithetic=False, control_variate=None)),
+                         ("antithetic", dict(antithetic=True, control_variate=None)),
+                         ("antithetic + stock", dict(antithetic=True, control_variate="stock")),
+                         ("antithetic + call", dict(antithetic=True, control_variate="call"))]:
+        estimate, std_error = variance_reduced_call_price(**option, n_paths=n_paths, **kwargs)
+        paths_needed = int(np.ceil(n_paths * (std_error / target_std_error) ** 2))
+        print(f"{name:>22} {estimate:>10.4f} {std_error:>10.5f} {paths_needed:>20}")
+
+
+def benchmark_qmc_convergence(path_counts=tuple(2 ** k for k in range(6, 15, 2)), n_repeats=20):
+    """RMSE of the DemonstrateSimulation price from pseudo-random vs. Sobol paths, against black_scholes_price."""
+    simulation_kwargs = dict(start_price=300, sigma=0.1, dt=1 / 252, T=0.25)
+    strike = 300
+    analytic = black_scholes_price(S0=300, K=strike, sigma=0.1, t=(int(0.25 * 252) - 1) / 252, r=0.0)
+
+    print(f"{'paths':>8} {'pseudo-random RMSE':>20} {'Sobol RMSE':>12}")
+    for n_paths in path_counts:
+        pseudo_random_errors, sobol_errors = [], []
+        for repeat in range(n_repeats):
+            pseudo_random = simple_stock_simulations(seeds=range(repeat * n_paths, (repeat + 1) * n_paths),
+                                                     scene="benchmark_qmc_convergence", **simulation_kwargs)
+            sobol = sobol_stock_simulations(n_paths=n_paths, seed=repeat, **simulation_kwargs)
+            pseudo_random_errors.append(np.maximum(pseudo_random[:, -1] - strike, 0.0).mean() - analytic)
+            sobol_errors.append(np.maximum(sobol[:, -1] - strike, 0.0).mean() - analytic)
+
+        rmse = lambda errors: np.sqrt(np.mean(np.square(errors)))
+        print(f"{n_paths:>8} {rmse(pseudo_random_errors):>20.5f} {rmse(sobol_errors):>12.5f}")
+
+
+if __name__ == "__main__":
+    demonstrate_streaming()
+    print()
+    benchmark_variance_reduction()
+    print()
+    benchmark_qmc_convergence()
@@ -0,0 +1,92 @@
+"""
+Generate large sets of simulated stock paths across a process pool.
+
+Workers write their chunks straight into a shared memory array, so paths are never pickled back to the parent or
+copied out of shared memory. Every path comes from its own seed (or path_rng stream), so the output is identical
+regardless of the number of workers.
+
+Running this file directly benchmarks the scaling from 1 to N cores.
+"""
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from shared_data_and_functions import simple_stock_simulations
+
+# set up once per worker by _attach_shared_paths
+_worker_shm = None
+_worker_paths = None
+
+
+def _attach_shared_paths(shm_name, shape):
+    global _worker_shm, _worker_paths
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_paths = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+
+
+def _simulate_chunk(first_row, seeds, simulation_kwargs):
+    _worker_paths[first_row:first_row + len(seeds)] = simple_stock_simulations(seeds=seeds, **simulation_kwargs)
+
+
+def parallel_stock_simulations(start_price=100, sigma=0.15, dt=1 / 252, T=1, seeds=range(1), scene=None,
+                               n_workers=None, chunk_size=None):
+    """
+    Parallel version of simple_stock_simulations, returning the same (n_paths, n_steps) array.
+
+    seeds is split into chunks of chunk_size paths (by default, about four chunks per worker) that are simulated in
+    separate processes. The array is backed directly by the shared memory, which is freed once neither it nor any view
+    of it is left.
+    """
+    n_workers = n_workers or os.cpu_count()
+    n_paths, n_steps = len(seeds), int(T / dt)
+    chunk_size = chunk_size or max(1, -(-n_paths // (4 * n_workers)))
+    simulation_kwargs = dict(start_price=start_price, sigma=sigma, dt=dt, T=T, scene=scene)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n_paths * n_steps * np.dtype(np.float64).itemsize))
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach_shared_paths,
+                                 initargs=(shm.name, (n_paths, n_steps))) as pool:
+            chunks = [pool.submit(_simulate_chunk, first_row, seeds[first_row:first_row + chunk_size],
+                                  simulation_kwargs)
+                      for first_row in range(0, n_paths, chunk_size)]
+            for chunk in chunks:
+                chunk.result()  # re-raises any worker exception
+    except BaseException:
+        shm.close()
+        raise
+    finally:
+        shm.unlink()  # only removes the name, the parent's mapping stays valid
+
+    # np.frombuffer keeps a buffer export on the mapping (unlike np.ndarray(buffer=...)), so it can't be closed under
+    # the array or its views. Closing it when that export's memoryview is collected releases the memory.
+    paths = np.frombuffer(shm.buf, dtype=np.float64, count=n_paths * n_steps)
+    weakref.finalize(paths.base, shm.close).atexit = False
+    return paths.reshape(n_paths, n_steps)
+
+
+def benchmark_scaling(n_paths=200_000, max_workers=None):
+    """Time parallel_stock_simulations from 1 to max_workers processes, checking the output never changes."""
+    max_workers = max_workers or os.cpu_count()
+    simulation_kwargs = dict(start_price=300, sigma=0.1, dt=1 / 252, T=1, seeds=range(n_paths),
+                             scene="benchmark_scaling")
+
+    print(f"{n_paths} paths x 252 steps")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    reference, single_worker_time = None, None
+    for n_workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        paths = parallel_stock_simulations(n_workers=n_workers, **simulation_kwargs)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference, single_worker_time = paths, elapsed
+        assert np.array_equal(paths, reference), "output changed with the number of workers"
+        print(f"{n_workers:>8} {elapsed:>10.3f} {single_worker_time / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_scaling()
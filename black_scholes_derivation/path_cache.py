@@ -0,0 +1,88 @@
+"""
+Content-addressed on-disk cache for simulated path sets.
+
+The same paths are otherwise regenerated on every render and at every quality level. Arrays are stored as .npy files
+named by a hash of the function and parameters that created them, and are read back as read-only memory maps so every
+reader gets a zero-copy view. Once the cache grows past its size cap, the least recently used files are evicted.
+
+The cache directory and size cap default to the PATH_CACHE_DIR and PATH_CACHE_MAX_BYTES environment variables. Keys
+don't capture the simulation code itself, so delete the cache directory after changing how paths are generated.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+PATH_CACHE_DIR = os.environ.get("PATH_CACHE_DIR", "path_cache")
+PATH_CACHE_MAX_BYTES = int(os.environ.get("PATH_CACHE_MAX_BYTES", 2 ** 30))
+
+
+def _cache_key(create, params):
+    def encode(value):
+        """
+        JSON fallback for the non-primitive parameters we pass around, e.g. seed ranges.
+
+        Sequences all encode as plain lists, so range(3), [0, 1, 2], (0, 1, 2) and np.arange(3) share a cache entry.
+        """
+        if isinstance(value, range):
+            return list(value)
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        raise TypeError(f"can't build a path cache key from {type(value).__name__}")
+
+    description = json.dumps([create.__module__, create.__qualname__, params], sort_keys=True, default=encode)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def evict_least_recently_used(cache_dir=None, max_bytes=None, keep=()):
+    """Delete the least recently used arrays until the cache fits in max_bytes, never deleting anything in keep."""
+    cache_dir = cache_dir or PATH_CACHE_DIR
+    max_bytes = PATH_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".npy"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # evicted by another render in the meantime
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        if path in keep:
+            continue
+        try:
+            os.remove(path)  # readers that already mapped this file keep their view
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+
+
+def cached_array(create, cache_dir=None, max_bytes=None, **params):
+    """Return create(**params) as a read-only memory map, only calling create() if it isn't already cached."""
+    cache_dir = cache_dir or PATH_CACHE_DIR
+    path = os.path.join(cache_dir, _cache_key(create, params) + ".npy")
+
+    try:
+        array = np.load(path, mmap_mode="r")
+        os.utime(path)  # modification time doubles as the last use for eviction
+        return array
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    array = np.asarray(create(**params))
+
+    # writing to a temporary file first so parallel renders never read a partially written array
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+        np.save(f, array)
+    os.replace(f.name, path)
+
+    evict_least_recently_used(cache_dir, max_bytes, keep=(path,))
+    return np.load(path, mmap_mode="r")
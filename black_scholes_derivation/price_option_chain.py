@@ -0,0 +1,129 @@
+"""
+Command line batch pricing of CSV option chains with the black_scholes_price derived in the video.
+
+The input needs S0, K, sigma, t and r columns, and any other columns are passed through unchanged. The file is read
+and priced in fixed-size chunks, and each chunk is written out as soon as it's priced, so memory use doesn't depend on
+the size of the file. With --processes, chunks are priced in a process pool without changing their order.
+
+For example,
+    python price_option_chain.py chain.csv -o priced.csv --greeks --implied-volatility market_price
+"""
+import argparse
+import csv
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+
+import numpy as np
+
+from implied_volatility import implied_volatility
+from shared_data_and_functions import BLACK_SCHOLES_GREEKS_DTYPE, black_scholes_greeks, black_scholes_price
+
+INPUT_COLUMNS = ("S0", "K", "sigma", "t", "r")
+
+
+def output_columns(greeks=False, implied_volatility_column=None):
+    columns = ["black_scholes_price"]
+    if greeks:
+        columns += BLACK_SCHOLES_GREEKS_DTYPE.names
+    if implied_volatility_column is not None:
+        columns.append("implied_volatility")
+    return columns
+
+
+def _float_columns(rows, column_indices):
+    try:
+        return np.array([[row[i] for i in column_indices] for row in rows], dtype=float)
+    except ValueError:
+        for row in rows:
+            for i in column_indices:
+                try:
+                    float(row[i])
+                except ValueError:
+                    raise ValueError(f"non-numeric value {row[i]!r} in row {','.join(row)}") from None
+        raise
+
+
+def price_chunk(rows, column_indices, greeks=False, market_price_index=None):
+    """Append the price, and optionally the Greeks and the implied volatility of a market price, to each CSV row."""
+    option = dict(zip(INPUT_COLUMNS, _float_columns(rows, column_indices).T))
+    results = [black_scholes_price(**option)]
+    if greeks:
+        greek_values = black_scholes_greeks(**option)
+        results += [greek_values[greek] for greek in greek_values.dtype.names]
+    if market_price_index is not None:
+        market_prices = _float_columns(rows, [market_price_index])[:, 0]
+        results.append(implied_volatility(market_prices, option["S0"], option["K"], option["t"], option["r"])[0])
+
+    return [row + list(row_results) for row, row_results in zip(rows, zip(*(result.tolist() for result in results)))]
+
+
+def _chunks(reader, chunk_size, n_columns):
+    """Chunks of the remaining rows, skipping blank lines and rejecting rows that don't match the header."""
+    def rows_with_data():
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != n_columns:
+                raise ValueError(f"line {reader.line_num} has {len(row)} field(s) but the header has {n_columns}")
+            yield row
+
+    rows = rows_with_data()
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _priced_chunks(price, chunks, processes):
+    """Apply price to every chunk in order, keeping at most two chunks per process in flight."""
+    if processes == 1:
+        yield from map(price, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(price, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="CSV option chain with S0, K, sigma, t and r columns, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="CSV file to write, or - for stdout (default)")
+    parser.add_argument("--greeks", action="store_true", help="also output delta, gamma, vega, theta and rho")
+    parser.add_argument("--implied-volatility", metavar="PRICE_COLUMN",
+                        help="also output the implied volatility of the market prices in this column")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows priced at a time (default %(default)s)")
+    parser.add_argument("--processes", type=int, default=1, help="processes to price chunks in (default %(default)s)")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.processes < 1:
+        parser.error("--chunk-size and --processes must be positive")
+
+    input_file = nullcontext(sys.stdin) if args.input == "-" else open(args.input, newline="")
+    output_file = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", newline="")
+    with input_file as f_in, output_file as f_out:
+        reader, writer = csv.reader(f_in), csv.writer(f_out)
+        header = next(reader, [])
+        missing = [c for c in INPUT_COLUMNS + ((args.implied_volatility,) if args.implied_volatility else ())
+                   if c not in header]
+        if missing:
+            parser.error(f"{args.input} is missing the column(s) {', '.join(missing)}")
+
+        price = partial(price_chunk, column_indices=[header.index(c) for c in INPUT_COLUMNS], greeks=args.greeks,
+                        market_price_index=header.index(args.implied_volatility) if args.implied_volatility else None)
+        writer.writerow(header + output_columns(args.greeks, args.implied_volatility))
+        try:
+            for priced_rows in _priced_chunks(price, _chunks(reader, args.chunk_size, len(header)), args.processes):
+                writer.writerows(priced_rows)
+        except ValueError as e:
+            parser.error(f"{args.input}: {e}")
+
+
+if __name__ == "__main__":
+    main()
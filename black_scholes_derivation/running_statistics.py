@@ -0,0 +1,79 @@
+"""Statistics that are updated from batches of streamed values, e.g. the profits of simulated options."""
+import numpy as np
+
+
+class StreamingHistogram:
+    """
+    Histogram counts that are updated from whole batches of values at once.
+
+    Bin i covers [bin_edges[i], bin_edges[i + 1]). With clip, values outside the edges are counted in the first or last
+    bin, otherwise they are dropped. Normalized frequencies are cached until the next update.
+    """
+
+    def __init__(self, bin_edges, clip=True):
+        self.bin_edges = np.asarray(bin_edges, dtype=float)
+        self.clip = clip
+        self.counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+        self._frequencies = None
+
+    def update(self, values):
+        n_bins = len(self.counts)
+        bin_indices = np.searchsorted(self.bin_edges, np.ravel(values), side="right") - 1
+        if self.clip:
+            np.clip(bin_indices, 0, n_bins - 1, out=bin_indices)
+        else:
+            bin_indices = bin_indices[(bin_indices >= 0) & (bin_indices < n_bins)]
+
+        self.counts += np.bincount(bin_indices, minlength=n_bins)
+        self._frequencies = None
+
+    @property
+    def frequencies(self):
+        """Counts normalized to sum to one (all zeros before any values are added)."""
+        if self._frequencies is None:
+            total = self.counts.sum()
+            self._frequencies = self.counts / total if total else np.zeros(len(self.counts))
+        return self._frequencies
+
+
+class RunningMoments:
+    """
+    Running count, mean and variance of streamed values.
+
+    Each batch's moments are merged in with the parallel form of Welford's algorithm (Chan et al.), so updates are
+    vectorized and numerically stable, and every query afterwards is O(1).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._sum_squared_deviations = 0.0
+
+    def update(self, values):
+        values = np.ravel(values)
+        if len(values) == 0:
+            return
+
+        batch_count, batch_mean = len(values), values.mean()
+        batch_sum_squared_deviations = np.square(values - batch_mean).sum()
+
+        count = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / count
+        self._sum_squared_deviations += (batch_sum_squared_deviations
+                                         + delta ** 2 * self.count * batch_count / count)
+        self.count = count
+
+    @property
+    def variance(self):
+        """Sample variance (nan until there are at least two values)."""
+        return self._sum_squared_deviations / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std_error(self):
+        """Standard error of the mean."""
+        return np.sqrt(self.variance / self.count) if self.count > 1 else np.nan
+
+    def confidence_interval(self, z=1.96):
+        """Normal-approximation confidence interval for the mean, 95% by default."""
+        return self.mean - z * self.std_error, self.mean + z * self.std_error
@@ -1,6 +1,14 @@
 """A set of a few common utilities and functions shared across multiple scripts."""
+# scenes star-import this module, so the imports they don't need are kept private
+import hashlib as _hashlib
+from functools import lru_cache as _lru_cache
+
 from manim import *
+from scipy.special import ndtr as _ndtr
 from scipy.stats import norm
+from scipy.stats import qmc as _qmc
+
+from path_cache import cached_array as _cached_array
 
 # just hardcoding this data here, as of May 10, 2025
 # from https://www.theocc.com/market-data/market-data-reports/volume-and-open-interest/historical-volume-statistics
@@ -47,15 +55,173 @@ def display_section_title(scene, section_shorthand):
     scene.play(FadeOut(title))
 
 
-def simple_stock_simulation(start_price=100, sigma=0.15, dt=1 / 252, T=1, seed=0):
-    np.random.seed(seed)
+# reseeding a single generator is much cheaper than constructing a new one per seed
+_legacy_rng = np.random.RandomState()
+
+
+def path_rng(scene, path_index, *sub_keys):
+    """
+    Independent random stream for one simulated path, keyed by (scene, path index).
+
+    Each stream is a counter-based Philox generator spawned from the scene's SeedSequence, so any subset of paths can be
+    regenerated on its own, in any order, on any number of workers and still come out bit-identical.
+    """
+    # hashing the name ourselves since hash() on strings is salted per process
+    scene_entropy = int.from_bytes(_hashlib.sha256(scene.encode()).digest()[:16], "little")
+    seed_sequence = np.random.SeedSequence(scene_entropy, spawn_key=(path_index, *sub_keys))
+    return np.random.Generator(np.random.Philox(seed_sequence))
+
+
+def standard_normal_paths(seeds, n_steps, scene=None, sub_keys=()):
+    """
+    Standard normal draws with one row per seed.
+
+    Without a scene, each seed reproduces the legacy np.random.seed(seed) draws that the rendered videos used. With a
+    scene, each seed is instead a path index into that scene's path_rng streams. Any sub_keys (e.g. a refinement level)
+    always select a path_rng stream, using an unnamed scene if none is given.
+    """
+    normals = np.empty((len(seeds), n_steps))
+    for row, seed in zip(normals, seeds):
+        if scene is None and not sub_keys:
+            _legacy_rng.seed(seed)
+            row[:] = _legacy_rng.standard_normal(n_steps)
+        else:
+            path_rng(scene or "", seed, *sub_keys).standard_normal(out=row)
+    return normals
+
+
+def simple_stock_simulation(start_price=100, sigma=0.15, dt=1 / 252, T=1, seed=0, scene=None):
+    return simple_stock_simulations(start_price=start_price, sigma=sigma, dt=dt, T=T, seeds=[seed], scene=scene)[0]
+
+
+def simple_stock_simulations(start_price=100, sigma=0.15, dt=1 / 252, T=1, seeds=range(1), scene=None):
+    """
+    Simulate one path per seed as a single (n_paths, n_steps) array.
+
+    Row i is identical to simple_stock_simulation(seed=seeds[i]). Without a scene, each seed still needs its own legacy
+    draws to keep the rendered videos unchanged, but everything after the draws is done in one pass. Passing a scene
+    switches to the order-independent path_rng streams instead.
+    """
     n_steps = int(T / dt)
-    increments = np.random.normal(0, sigma * np.sqrt(dt), n_steps)
-    increments[0] = 0.0  # want t0 exactly at the start price
-    prices = start_price * np.exp(np.cumsum(increments) - (sigma ** 2 / 2) * dt * np.arange(n_steps))
+    increments = standard_normal_paths(seeds, n_steps, scene=scene) * (sigma * np.sqrt(dt))
+    increments[:, 0] = 0.0  # want t0 exactly at the start price
+    prices = start_price * np.exp(np.cumsum(increments, axis=1) - (sigma ** 2 / 2) * dt * np.arange(n_steps))
     return prices
 
 
+def _brownian_bridge_schedule(n_steps):
+    """(left, middle, right) step indices in the order a Brownian bridge fills in a path of n_steps unit steps."""
+    schedule, intervals = [], [(0, n_steps)]
+    for left, right in intervals:  # breadth-first, so coarse midpoints come before fine ones
+        if right - left > 1:
+            middle = (left + right) // 2
+            schedule.append((left, middle, right))
+            intervals += [(left, middle), (middle, right)]
+    return schedule
+
+
+def sobol_stock_simulations(start_price=100, sigma=0.15, dt=1 / 252, T=1, n_paths=1, seed=0):
+    """
+    Quasi-Monte Carlo version of simple_stock_simulations, built from scrambled Sobol points.
+
+    Each path uses one Sobol point, mapped through the inverse normal CDF. Its dimensions are assigned in Brownian
+    bridge order, so the first (best distributed) dimension sets the final price, the next sets the midpoint, and so
+    on. That makes distributions of (mostly) terminal prices converge with far fewer paths. n_paths should be a power
+    of 2 to keep the balance properties of the Sobol sequence, and seed picks the scrambling.
+    """
+    n_steps = int(T / dt)
+    n_increments = n_steps - 1  # the first step is pinned at the start price
+    normals = norm.ppf(_qmc.Sobol(n_increments, scramble=True, seed=seed).random(n_paths))
+
+    brownian = np.empty((n_paths, n_steps))
+    brownian[:, 0] = 0.0
+    brownian[:, -1] = np.sqrt(n_increments) * normals[:, 0]
+    for dimension, (left, middle, right) in enumerate(_brownian_bridge_schedule(n_increments), start=1):
+        brownian[:, middle] = (((right - middle) * brownian[:, left] + (middle - left) * brownian[:, right])
+                               / (right - left)
+                               + np.sqrt((middle - left) * (right - middle) / (right - left)) * normals[:, dimension])
+
+    return start_price * np.exp(sigma * np.sqrt(dt) * brownian - (sigma ** 2 / 2) * dt * np.arange(n_steps))
+
+
+def brownian_bridge_stock_simulations(start_price=100, end_prices=100, sigma=0.15, dt=1 / 252, T=1, seeds=range(1),
+                                      scene=None):
+    """
+    Simulate one path per seed that starts at start_price and ends exactly at end_prices (one per seed, or shared).
+
+    These are the simple_stock_simulations paths conditioned on both endpoints, i.e. a Brownian bridge in log price, in
+    the same (n_paths, n_steps) layout. The drift cancels out once both ends are pinned.
+    """
+    n_steps = int(T / dt)
+    log_paths = standard_normal_paths(seeds, n_steps, scene=scene) * (sigma * np.sqrt(dt))
+    log_paths[:, 0] = 0.0
+    np.cumsum(log_paths, axis=1, out=log_paths)
+
+    end_prices = np.broadcast_to(np.asarray(end_prices, dtype=float), (len(seeds),))
+    fraction = np.arange(n_steps) / (n_steps - 1)
+    log_paths += fraction * (np.log(end_prices / start_price)[:, None] - log_paths[:, -1:]) + np.log(start_price)
+
+    prices = np.exp(log_paths, out=log_paths)
+    prices[:, 0], prices[:, -1] = start_price, end_prices  # exactly, rather than up to rounding in exp/log
+    return prices
+
+
+def refine_brownian_bridge(paths, sigma=0.15, dt=1 / 252, seeds=range(1), scene=None, level=1):
+    """
+    Halve the time step of existing paths by inserting a Brownian bridge midpoint between every pair of prices.
+
+    The original prices are kept exactly, so coarse paths can be refined on demand (level 1, then 2, ...) without
+    changing how they look. dt is the time step of the paths being refined and each level has its own random streams.
+    """
+    paths = np.asarray(paths)
+    log_paths = np.log(paths)
+    midpoints = standard_normal_paths(seeds, paths.shape[1] - 1, scene=scene, sub_keys=(level,))
+    midpoints *= sigma * np.sqrt(dt / 4)  # bridge variance halfway across an interval of length dt
+    midpoints += (log_paths[:, :-1] + log_paths[:, 1:]) / 2
+
+    refined = np.empty((paths.shape[0], 2 * paths.shape[1] - 1))
+    refined[:, ::2] = paths
+    refined[:, 1::2] = np.exp(midpoints)
+    return refined
+
+
+def steps_for_pixel_width(ax, t_span, pixels_per_step=2):
+    """Number of time steps across t_span on the x-axis of ax so that each step covers about pixels_per_step pixels."""
+    pixels = ax.x_axis.get_unit_size() * t_span * config.pixel_width / config.frame_width
+    return max(1, int(np.ceil(pixels / pixels_per_step)))
+
+
+def adaptive_stock_simulations(ax, start_price=100, sigma=0.15, T=1, seeds=range(1), scene=None, pixels_per_step=2,
+                               coarse_steps=16):
+    """
+    Simulate one path per seed over [0, T] with a time step picked from the rendered pixel width of ax.
+
+    Each path starts with coarse_steps steps and is refined by Brownian bridge midpoints until a step covers at most
+    pixels_per_step pixels. Coarser grids are subsets of finer ones (fine increments sum exactly to the coarse ones), so
+    a path looks the same at every render quality while its vertex count scales with the output resolution. Paths have
+    coarse_steps * 2**levels + 1 prices, including both endpoints.
+    """
+    dt = T / coarse_steps
+    log_increments = standard_normal_paths(seeds, coarse_steps, scene=scene) * (sigma * np.sqrt(dt))
+    log_increments -= sigma ** 2 / 2 * dt
+    paths = np.empty((len(seeds), coarse_steps + 1))
+    paths[:, 0] = 0.0
+    np.cumsum(log_increments, axis=1, out=paths[:, 1:])
+    paths = start_price * np.exp(paths)
+
+    levels = max(0, int(np.ceil(np.log2(steps_for_pixel_width(ax, T, pixels_per_step) / coarse_steps))))
+    for level in range(1, levels + 1):
+        paths = refine_brownian_bridge(paths, sigma=sigma, dt=dt, seeds=seeds, scene=scene, level=level)
+        dt /= 2
+    return paths
+
+
+def cached_stock_simulations(start_price=100, sigma=0.15, dt=1 / 252, T=1, seeds=range(1), scene=None):
+    """Read-only simple_stock_simulations paths, simulated once and then shared through the on-disk path cache."""
+    return _cached_array(simple_stock_simulations, start_price=start_price, sigma=sigma, dt=dt, T=T, seeds=seeds,
+                         scene=scene)
+
+
 def stock_price_to_today(header_object, sigma=0.15):
     """Plot stock price graph up to today, leaving the second half of the graph empty."""
     # add in stock price graph
@@ -74,7 +240,7 @@ def stock_price_to_today(header_object, sigma=0.15):
     labels = ax.get_axis_labels(x_label=r"\text{Time}", y_label=r"\text{Stock Price}")
 
     # plot first just up to "today" (internally, t=0.5)
-    simulated_path = simple_stock_simulation(start_price=300, sigma=sigma, seed=10, T=0.5)
+    simulated_path = cached_stock_simulations(start_price=300, sigma=sigma, seeds=[10], T=0.5)[0]
     graph = ax.plot_line_graph(
         x_values=np.linspace(0, 0.5, len(simulated_path)),
         y_values=simulated_path,
@@ -107,8 +273,214 @@ def stock_price_simulation_graph(stock_price_range=(250, 350.1, 25), strike=300,
     return ax, labels, strike_line
 
 
-def black_scholes_price(S0, K, sigma, t, r):
+def coords_to_points(ax, xs, ys):
+    """Vectorized ax.c2p for arrays of coordinates, since linear axes map coordinates to points affinely."""
+    origin = np.array(ax.c2p(0.0, 0.0))
+    x_unit, y_unit = np.array(ax.c2p(1.0, 0.0)) - origin, np.array(ax.c2p(0.0, 1.0)) - origin
+    return origin + np.multiply.outer(xs, x_unit) + np.multiply.outer(ys, y_unit)
+
+
+def get_sampled_area(ax, xs, ys, x_range, color=BLUE, opacity=0.3):
+    """
+    Shaded area between the x-axis and a curve sampled as ys = f(xs), over x_range.
+
+    This matches ax.get_area(ax.plot(f), x_range), but reuses samples that were already computed (e.g. for
+    plot_line_graph) instead of plotting f again, interpolating the curve at the ends of x_range.
+    """
+    x_start, x_stop = x_range
+    inside = (xs > x_start) & (xs < x_stop)
+    y_start, y_stop = np.interp(x_range, xs, ys)
+    area_xs = np.concatenate([[x_start, x_start], xs[inside], [x_stop, x_stop]])
+    area_ys = np.concatenate([[0.0, y_start], ys[inside], [y_stop, 0.0]])
+    return Polygon(*coords_to_points(ax, area_xs, area_ys)).set_opacity(opacity).set_color(color)
+
+
+class LiveLineGraph(VMobject):
+    """
+    Line graph on ax, like plot_line_graph without vertex dots, whose y-values can be replaced every frame.
+
+    Updaters can call set_y_values, which rewrites the existing points in place, instead of building a whole new graph
+    to become.
+    """
+
+    def __init__(self, ax, x_values, y_values, line_color=YELLOW, **kwargs):
+        super().__init__(color=line_color, **kwargs)
+        self.x_values = np.asarray(x_values, dtype=float)
+        # a closure rather than an attribute, so copies of the graph (e.g. in animations) don't deep copy the axes
+        self.coords_to_points = lambda xs, ys: coords_to_points(ax, xs, ys)
+        self.set_points_as_corners(self.coords_to_points(self.x_values, y_values))
+
+    def set_y_values(self, y_values):
+        corners = self.coords_to_points(self.x_values, y_values)
+        curves = self.points.reshape(-1, 4, 3)  # a view with the anchors and handles of one segment per row
+        curves[:, 0], curves[:, 3] = corners[:-1], corners[1:]
+        curves[:, 1] = (2 * corners[:-1] + corners[1:]) / 3
+        curves[:, 2] = (corners[:-1] + 2 * corners[1:]) / 3
+        return self
+
+
+def curve_crossings(f, g, x_range, n_samples=1000, xtol=1e-8, max_iterations=100):
+    """
+    Every x in x_range where f(x) = g(x), in increasing order, for f and g that accept arrays.
+
+    Sign changes of f - g are located on n_samples evenly spaced points in one pass, then all of them are polished at
+    once with false position steps (with the Illinois modification), falling back to bisection for any step that would
+    leave its bracket, until every bracket is narrower than xtol. Samples where the curves agree exactly only count
+    where the sign changes across them, so curves that coincide over a region (e.g. zero-density tails) give at most
+    one crossing there. Crossings closer together than the sample spacing, or where the curves only touch, can be
+    missed.
+    """
+    difference = lambda x: f(x) - g(x)
+    xs = np.linspace(*x_range[:2], n_samples)
+    differences = difference(xs)
+
+    # a run of samples where the curves agree exactly is one crossing (at its middle) if the sign changes across it
+    run_edges = np.diff(np.concatenate([[0], (differences == 0).astype(np.int8), [0]]))
+    run_starts, run_ends = np.flatnonzero(run_edges == 1), np.flatnonzero(run_edges == -1) - 1
+    interior = (run_starts > 0) & (run_ends < n_samples - 1)
+    run_starts, run_ends = run_starts[interior], run_ends[interior]
+    crosses = np.sign(differences[run_starts - 1]) != np.sign(differences[run_ends + 1])
+    exact_crossings = ((xs[run_starts] + xs[run_ends]) / 2)[crosses]
+
+    brackets = np.flatnonzero(np.sign(differences[:-1]) * np.sign(differences[1:]) < 0)
+    lower, upper = xs[brackets], xs[brackets + 1]
+    f_lower, f_upper = differences[brackets], differences[brackets + 1]
+    kept_lower_last = np.zeros(len(brackets), dtype=bool)
+    kept_upper_last = np.zeros(len(brackets), dtype=bool)
+    for _ in range(max_iterations):
+        active = upper - lower > xtol
+        if not active.any():
+            break
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = (lower * f_upper - upper * f_lower) / (f_upper - f_lower)
+        candidate = np.where((candidate > lower) & (candidate < upper), candidate, (lower + upper) / 2)
+        f_candidate = difference(candidate)
+
+        replace_lower = active & (np.sign(f_candidate) == np.sign(f_lower))
+        replace_upper = active & ~replace_lower
+        # halving the value at an endpoint that survives twice in a row stops false position from stalling on one side
+        f_upper = np.where(replace_lower & kept_upper_last, f_upper / 2, f_upper)
+        f_lower = np.where(replace_upper & kept_lower_last, f_lower / 2, f_lower)
+        lower, f_lower = np.where(replace_lower, candidate, lower), np.where(replace_lower, f_candidate, f_lower)
+        upper, f_upper = np.where(replace_upper, candidate, upper), np.where(replace_upper, f_candidate, f_upper)
+        kept_upper_last, kept_lower_last = replace_lower, replace_upper
+
+        hit = active & (f_candidate == 0)
+        lower, upper = np.where(hit, candidate, lower), np.where(hit, candidate, upper)
+
+    return np.sort(np.concatenate([exact_crossings, (lower + upper) / 2]))
+
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _norm_cdf(x, out=None):
+    """Standard normal CDF, skipping the argument checking and dispatch that make norm.cdf slow on small arrays."""
+    return _ndtr(x, out=out)
+
+
+def _norm_pdf(x, out=None):
+    """Standard normal PDF (matching norm.pdf exactly), optionally computed into an existing buffer."""
+    out = np.square(x, out=np.empty(np.shape(x)) if out is None else out)
+    out *= -0.5
+    np.exp(out, out=out)
+    out /= _SQRT_2PI
+    return out
+
+
+def _black_scholes_terms(S0, K, sigma, t, r):
+    """Broadcast inputs and the discount factor, total volatility, d_plus and d_minus they share."""
+    S0, K, sigma, t, r = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S0, K, sigma, t, r)))
     D = np.exp(-r * t)
-    d_plus = (np.log(S0 / D / K) + sigma ** 2 * t / 2) / (sigma * np.sqrt(t))
-    d_minus = d_plus - sigma * np.sqrt(t)
-    return D * (S0 / D * norm.cdf(d_plus) - K * norm.cdf(d_minus))
+    total_volatility = sigma * np.sqrt(t)
+    degenerate = total_volatility <= 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):  # S0 = 0 or K = 0 are fine, degenerate entries are replaced
+        log_moneyness = np.log(S0 / D / K)
+        d_plus = (log_moneyness + sigma ** 2 * t / 2) / total_volatility
+    # as sigma * sqrt(t) goes to zero, only which side of the (discounted) strike we're on matters
+    d_plus = np.where(degenerate, np.copysign(np.inf, log_moneyness), d_plus)
+    d_minus = np.asarray(d_plus - total_volatility)  # kept as an array, even for scalar inputs, to reuse as a buffer
+    return S0, K, sigma, t, r, D, total_volatility, degenerate, d_plus, d_minus
+
+
+def black_scholes_price(S0, K, sigma, t, r):
+    """
+    Call option price, with every input broadcasting like a NumPy array so whole sweeps price in one pass.
+
+    As sigma * sqrt(t) goes to zero, this tends to the discounted intrinsic value max(S0 - D * K, 0), which is handled
+    without dividing by zero.
+    """
+    S0, K, sigma, t, r, D, _, _, d_plus, d_minus = _black_scholes_terms(S0, K, sigma, t, r)
+    # d_plus and d_minus are scratch arrays, so their probabilities can overwrite them
+    price = D * (S0 / D * _norm_cdf(d_plus, out=d_plus) - K * _norm_cdf(d_minus, out=d_minus))
+    return price[()]  # unwrapping scalar inputs back to a scalar
+
+
+BLACK_SCHOLES_GREEKS_DTYPE = np.dtype([(greek, float) for greek in ("delta", "gamma", "vega", "theta", "rho")])
+
+
+def black_scholes_greeks(S0, K, sigma, t, r):
+    """
+    Delta, gamma, vega, theta and rho of black_scholes_price, as a structured array in one vectorized pass.
+
+    All five share the discount factor, d_plus, d_minus and a single set of normal PDF/CDF evaluations, so together they
+    cost about as much as one pricing pass. Theta is per year of calendar time, i.e. the negative of dC/dt.
+    """
+    S0, K, sigma, t, r, D, total_volatility, degenerate, d_plus, d_minus = _black_scholes_terms(S0, K, sigma, t, r)
+    pdf_plus = _norm_pdf(d_plus)
+    cdf_plus, cdf_minus = _norm_cdf(d_plus, out=d_plus), _norm_cdf(d_minus, out=d_minus)
+    discounted_strike_in_the_money = D * K * cdf_minus
+
+    greeks = np.empty(S0.shape, dtype=BLACK_SCHOLES_GREEKS_DTYPE)
+    greeks["delta"] = cdf_plus
+    greeks["vega"] = S0 * pdf_plus * np.sqrt(t)
+    greeks["rho"] = t * discounted_strike_in_the_money
+    with np.errstate(divide="ignore", invalid="ignore"):  # the density at d_plus vanishes when degenerate
+        greeks["gamma"] = np.where(degenerate, 0.0, pdf_plus / (S0 * total_volatility))
+        time_decay = np.where(degenerate, 0.0, S0 * pdf_plus * sigma / (2 * np.sqrt(t)))
+    greeks["theta"] = -time_decay - r * discounted_strike_in_the_money
+    return greeks[()]
+
+
+def _lognormal_z_score(x, S0, mu, sigma):
+    with np.errstate(divide="ignore", invalid="ignore"):  # x <= 0 is outside the support and replaced by callers
+        return np.asarray((np.log(np.asarray(x, dtype=float) / S0) - mu) / sigma)
+
+
+def lognormal_pdf(x, S0=1.0, mu=0.0, sigma=1.0):
+    """Density of S0 * exp(N(mu, sigma^2)), i.e. lognorm.pdf(x, s=sigma, scale=S0 * exp(mu)) without its overhead."""
+    z = _lognormal_z_score(x, S0, mu, sigma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        density = _norm_pdf(z) / (sigma * np.asarray(x, dtype=float))
+    return np.where(np.asarray(x) > 0, density, 0.0)[()]
+
+
+def lognormal_cdf(x, S0=1.0, mu=0.0, sigma=1.0):
+    """P(S <= x) for S = S0 * exp(N(mu, sigma^2))."""
+    z = _lognormal_z_score(x, S0, mu, sigma)
+    return np.where(np.asarray(x) > 0, _norm_cdf(z), 0.0)[()]
+
+
+def lognormal_partial_expectation(x, S0=1.0, mu=0.0, sigma=1.0):
+    """E[S; S > x] for S = S0 * exp(N(mu, sigma^2)), the expectation half of the Black-Scholes derivation."""
+    z = _lognormal_z_score(x, S0, mu, sigma)
+    mean = S0 * np.exp(mu + sigma ** 2 / 2)
+    return np.where(np.asarray(x) > 0, mean * _norm_cdf(sigma - z), mean)[()]
+
+
+@_lru_cache(maxsize=256)
+def sampled_lognormal_pdf(S0, mu, sigma, x_start, x_stop, n=1000):
+    """
+    (xs, lognormal_pdf(xs, S0, mu, sigma)) over np.linspace(x_start, x_stop, n).
+
+    These are memoized, so the same distribution is only sampled once across frames and scenes. The arrays are shared
+    between callers and so are read-only.
+    """
+    xs = np.linspace(x_start, x_stop, n)
+    pdf = lognormal_pdf(xs, S0, mu, sigma)
+    xs.setflags(write=False)
+    pdf.setflags(write=False)
+    return xs, pdf
+
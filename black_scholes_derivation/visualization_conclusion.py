@@ -3,9 +3,10 @@ Animation of the stock price distribution and payoff diagram as we sweep each of
 closes with a simple list of high-level takeaways from the entire discussion.
 """
 from manim import *
-from scipy.stats import lognorm
 
-from shared_data_and_functions import TEXT_SIZE_MEDIUM, MATH_SIZE_MEDIUM, black_scholes_price, display_section_title
+from shared_data_and_functions import (TEXT_SIZE_MEDIUM, MATH_SIZE_MEDIUM, LiveLineGraph, black_scholes_price,
+                                       coords_to_points, display_section_title, get_sampled_area,
+                                       sampled_lognormal_pdf)
 
 
 class BlackScholesVisualization(Scene):
@@ -37,6 +38,7 @@ class BlackScholesVisualization(Scene):
         self.S0, self.sigma, self.t, self.K, self.r = (ValueTracker(x) for x in (300.0, 0.10, 0.25, 310.0, 0.04))
         self.variable_positions = None  # will be used to fix positions of the Black-Scholes variables latex
         self.variable_highlight_idx = None
+        self.frame_cache = {}  # builder name -> (variable values, output) for the most recent frame
 
         self.payoff_ax = Axes(
             x_range=[250.0, 350.1, 25],
@@ -59,22 +61,36 @@ class BlackScholesVisualization(Scene):
         )
         self.payoff_labels[0].next_to(self.payoff_ax.x_axis.get_center(), DOWN, buff=0.75)
 
+    def price_distribution_samples(self):
+        """Sample the price distribution for the current Black-Scholes parameters across the x-axis."""
+        lognorm_mu = self.sigma.get_value() ** 2 * self.t.get_value() / 2
+        lognorm_sigma = self.sigma.get_value() * np.sqrt(self.t.get_value())
+        return sampled_lognormal_pdf(self.S0.get_value(), lognorm_mu, lognorm_sigma, *self.price_ax.x_range[:2])
+
     def create_price_distribution(self):
-        """Create the graph for the price distribution, depending on the current Black-Scholes parameters."""
-        lognorm_scale = self.S0.get_value() * np.exp(self.sigma.get_value() ** 2 * self.t.get_value() / 2)
-        lognorm_s = self.sigma.get_value() * np.sqrt(self.t.get_value())
-        lognorm_pdf = lambda xs: lognorm.pdf(xs, scale=lognorm_scale, s=lognorm_s)
-
-        plot_xs = np.linspace(*self.price_ax.x_range[:2], 1000)
-        price_pdf_plot = self.price_ax.plot_line_graph(plot_xs, lognorm_pdf(plot_xs), line_color=BLUE,
-                                                       add_vertex_dots=False, z_index=1)
+        """Create the strike line and the area above it under the price distribution, for the current parameters."""
+        plot_xs, pdf_ys = self.price_distribution_samples()
         strike_line = DashedLine(self.price_ax.c2p(self.K.get_value(), 0.0),
                                  self.price_ax.c2p(self.K.get_value(), self.price_ax.y_range[1]))
-        area_above_strike = self.price_ax.get_area(self.price_ax.plot(lognorm_pdf),
-                                                   x_range=(self.K.get_value(), self.price_ax.x_range[1]),
-                                                   color=BLUE, opacity=0.5)
+        area_above_strike = get_sampled_area(self.price_ax, plot_xs, pdf_ys,
+                                             x_range=(self.K.get_value(), self.price_ax.x_range[1]),
+                                             color=BLUE, opacity=0.5)
+
+        return strike_line, area_above_strike
+
+    def create_for_current_frame(self, builder):
+        """
+        Output of builder() for the current variable values.
 
-        return price_pdf_plot, strike_line, area_above_strike
+        Several updaters keep different parts of the same builder's output, so this is memoized on the variable values
+        to build everything once per frame.
+        """
+        values = tuple(x.get_value() for x in (self.S0, self.sigma, self.t, self.K, self.r))
+        cached_values, output = self.frame_cache.get(builder.__name__, (None, None))
+        if cached_values != values:
+            output = builder()
+            self.frame_cache[builder.__name__] = (values, output)
+        return output
 
     def create_text(self):
         """Create TeX for the Black-Scholes variables with some hacky fixed positioning."""
@@ -98,31 +114,26 @@ class BlackScholesVisualization(Scene):
 
         return variables
 
-    def create_payoff_diagram(self):
-        """Create payoff diagram with option prices. A dot will indicate the one for the current stock price."""
-        plot_xs = np.linspace(*self.price_ax.x_range[:2], 1000)
-        intrinsic_price = self.payoff_ax.plot_line_graph(
-            x_values=plot_xs,
-            y_values=np.maximum(plot_xs - self.K.get_value(), 0.0),
-            line_color=WHITE, add_vertex_dots=False, z_index=1
+    def option_prices(self, S0):
+        """Option prices at the given stock prices for the current values of the other variables."""
+        return black_scholes_price(
+            S0=S0, K=self.K.get_value(), sigma=self.sigma.get_value(), t=self.t.get_value(), r=self.r.get_value()
         )
-        intrinsic_price = DashedVMobject(intrinsic_price['line_graph'], num_dashes=50)
 
-        def option_price_fn(x):
-            return black_scholes_price(
-                S0=x, K=self.K.get_value(), sigma=self.sigma.get_value(), t=self.t.get_value(), r=self.r.get_value()
-            )
+    def create_payoff_diagram(self):
+        """Create payoff diagram with the intrinsic value and a dot for the option price at the current stock price."""
+        # the intrinsic value max(S0 - K, 0) only needs its corners rather than a densely sampled line
+        x_min, x_max = self.payoff_ax.x_range[:2]
+        corner_xs = np.array([x_min, np.clip(self.K.get_value(), x_min, x_max), x_max])
+        corners = coords_to_points(self.payoff_ax, corner_xs, np.maximum(corner_xs - self.K.get_value(), 0.0))
+        intrinsic_price = DashedVMobject(VMobject(color=WHITE, z_index=1).set_points_as_corners(corners),
+                                         num_dashes=50)
 
-        option_price_plot = self.payoff_ax.plot_line_graph(
-            x_values=plot_xs,
-            y_values=[option_price_fn(x) for x in plot_xs],
-            line_color=BLUE, add_vertex_dots=False, z_index=2
-        )
         option_price_dot = Dot(
-            self.payoff_ax.c2p(self.S0.get_value(), option_price_fn(self.S0.get_value())),
+            self.payoff_ax.c2p(self.S0.get_value(), self.option_prices(self.S0.get_value())),
             color=WHITE, radius=0.1, z_index=3
         )
-        return intrinsic_price, option_price_dot, option_price_plot
+        return intrinsic_price, option_price_dot
 
     def sweep_variables(self, sweep_sequence):
         """
@@ -156,7 +167,8 @@ class BlackScholesVisualization(Scene):
             (self.r.get_value(),)
         ])
 
-        price_pdf_plot, strike_line, area_above_strike = self.create_price_distribution()
+        price_pdf_plot = LiveLineGraph(self.price_ax, *self.price_distribution_samples(), line_color=BLUE, z_index=1)
+        strike_line, area_above_strike = self.create_price_distribution()
         self.play(Create(self.price_ax), Write(self.price_labels), run_time=2.0)
         self.play(Create(price_pdf_plot, rate_func=linear))
         self.wait(1.0)
@@ -166,9 +178,11 @@ class BlackScholesVisualization(Scene):
         self.wait(1.0)
 
         # updaters for price distribution plot (left)
-        price_pdf_plot.add_updater(lambda m: m.become(self.create_price_distribution()[0]))
-        strike_line.add_updater(lambda m: m.become(self.create_price_distribution()[1]))
-        area_above_strike.add_updater(lambda m: m.become(self.create_price_distribution()[2]))
+        price_pdf_plot.add_updater(lambda m: m.set_y_values(self.price_distribution_samples()[1]))
+        strike_line.add_updater(
+            lambda m: m.become(self.create_for_current_frame(self.create_price_distribution)[0]))
+        area_above_strike.add_updater(
+            lambda m: m.become(self.create_for_current_frame(self.create_price_distribution)[1]))
 
         # while just the price distribution is on screen, sweep each variable up and down
         self.sweep_variables([
@@ -176,7 +190,7 @@ class BlackScholesVisualization(Scene):
             (280.0, 320.0, 300.0), (0.06, 0.20, 0.10), (0.10, 1.0, 0.25), (280.0, 320.0, 310.0), ()
         ])
 
-        intrinsic_price, option_price_dot, option_price_plot = self.create_payoff_diagram()
+        intrinsic_price, option_price_dot = self.create_payoff_diagram()
         self.play(Create(self.payoff_ax), Write(self.payoff_labels), run_time=2.0)
         self.play(Create(intrinsic_price), rate_func=linear)
         self.wait(1.0)
@@ -185,8 +199,10 @@ class BlackScholesVisualization(Scene):
         self.wait(1.0)
 
         # updaters for payoff diagram dot (right)
-        intrinsic_price.add_updater(lambda m: m.become(self.create_payoff_diagram()[0]))
-        option_price_dot.add_updater(lambda m: m.become(self.create_payoff_diagram()[1]))
+        intrinsic_price.add_updater(
+            lambda m: m.become(self.create_for_current_frame(self.create_payoff_diagram)[0]))
+        option_price_dot.add_updater(
+            lambda m: m.become(self.create_for_current_frame(self.create_payoff_diagram)[1]))
 
         # sweep the dot left and right before we show the actual option price plot (larger range for S0 than before)
         self.sweep_variables([
@@ -194,11 +210,14 @@ class BlackScholesVisualization(Scene):
             (260.0, 340.0, 300.0), (), (), (), ()
         ])
 
+        payoff_xs = np.linspace(*self.payoff_ax.x_range[:2], 1000)
+        option_price_plot = LiveLineGraph(self.payoff_ax, payoff_xs, self.option_prices(payoff_xs), line_color=BLUE,
+                                          z_index=2)
         self.play(FadeIn(option_price_plot))
         self.wait(1.0)
 
         # this updater needs to come after the FadeIn for it to render properly
-        option_price_plot.add_updater(lambda m: m.become(self.create_payoff_diagram()[2]))
+        option_price_plot.add_updater(lambda m: m.set_y_values(self.option_prices(m.x_values)))
 
         # sweeping all the variables again (including the risk-free rate) now that the payoff diagram is displayed
         self.sweep_variables([